@@ -12,18 +12,53 @@ Usage:
 """
 
 import argparse
+import gzip
+import hashlib
+import html
+import io
 import json
 import logging
+import multiprocessing
+import os
+import random
 import re
+import signal
+import sqlite3
 import sys
+import threading
 import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from itertools import repeat
 from pathlib import Path
+from typing import BinaryIO, NamedTuple
 from urllib.parse import urljoin
 
+import platformdirs
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
 
-__all__ = ["scrape_catalog", "main"]
+__all__ = ["Book", "scrape_catalog", "iter_catalog", "main"]
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -43,6 +78,90 @@ USER_AGENT = (
 
 HEADERS = {"User-Agent": USER_AGENT}
 
+# Concurrent requests in flight; pacing is left to the shared LIMITER
+MAX_WORKERS = 8
+
+# Retries for rate-limited (429) or failing (5xx) responses, backing off
+# RETRY_BACKOFF * 2**attempt seconds plus jitter
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Detail pages handed to a parser process per batch, to amortise IPC
+PARSE_CHUNKSIZE = 32
+
+# Patterns applied on every page, compiled once. Listing pages are only
+# mined for the pager count and product links, so they are matched on the
+# raw response bytes instead of being parsed into a DOM. The link pattern
+# approximates li.item.item_product h3.title a for the shop's own markup
+# and assumes:
+#   - lower-case tags and double-quoted class / href attributes
+#     (extra classes and other attributes, in any order, are fine)
+#   - no nested <li> inside an item before its h3.title
+#   - the <a> as the first element inside h3.title, not wrapped in another
+# The captured href stops at "?" to drop tracking params like ?lid=1 and
+# still has HTML entities (&amp;) encoded.
+_PAGER_RE = re.compile(rb'id="listpager".*?Anzahl:\s*(\d[\d.]*)', re.S)
+_LISTING_URL_RE = re.compile(
+    rb'<li\b[^>]*\bclass="'
+    rb'(?=(?:[^"]*\s)?item[\s"])(?=(?:[^"]*\s)?item_product[\s"])[^"]*"[^>]*>'
+    rb"(?:(?!</li>).)*?"
+    rb'<h3\b[^>]*\bclass="(?:[^"]*\s)?title[\s"][^>]*>\s*'
+    rb'<a\b[^>]*\bhref="([^"?]+)',
+    re.S,
+)
+_ISBN_RE = re.compile(r"(978[\d-]{10,})")
+_DATE_PREFIX_RE = re.compile(r"^Veröffentlicht:\s*")
+_KW_PREFIX_RE = re.compile(r"^Schlagworte:\s*")
+
+# Detail page containers by (tag, class), plus the description block
+# div#pdesc, matched together by one grouped selector
+_DETAIL_PARTS = {
+    ("h1", "title"): "title",
+    ("h2", "subtitle"): "subtitle",
+    ("div", "authors"): "authors",
+    ("div", "number"): "number",
+    ("div", "price"): "price",
+    ("div", "info"): "info",
+    ("div", "dateof"): "dateof",
+    ("div", "serial"): "serial",
+    ("div", "keywords"): "keywords",
+}
+_DETAIL_SELECTOR = ", ".join(
+    [f"{tag}.{cls}" for tag, cls in _DETAIL_PARTS] + ["div#pdesc"]
+)
+
+# Responses are cached on disk (~/.cache/matthes-seitz-catalog.sqlite on
+# Linux) so re-runs only hit the network for new or changed pages.
+# cache_control=True honours Cache-Control and revalidates with ETag /
+# Last-Modified, letting the server answer 304 instead of resending the page.
+SESSION = requests_cache.CachedSession(
+    "matthes-seitz-catalog",
+    backend="sqlite",
+    use_cache_dir=True,
+    expire_after=timedelta(days=7),
+    cache_control=True,
+)
+SESSION.headers.update(HEADERS)
+# One keep-alive pool for the single host, large enough for all workers, so
+# connections (and their TLS handshakes) are reused across requests.
+# Only connection errors are retried here; status retries (which urllib3
+# would otherwise do for 413/429/503 with a Retry-After header) are left to
+# _get(), so they go through LIMITER and are not multiplied.
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            status=0,
+            respect_retry_after_header=False,
+            backoff_factor=0.5,
+        ),
+    ),
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)-8s %(message)s",
@@ -51,6 +170,287 @@ logging.basicConfig(
 log = logging.getLogger("matthes-seitz-catalog")
 
 
+# ---------------------------------------------------------------------------
+# Book record
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class Book:
+    """Metadata of a single book, as scraped from its detail page.
+
+    Field order matches the JSON output; use :func:`dataclasses.asdict`
+    for a plain dict.
+    """
+
+    url: str
+    imprint: str
+    title: str
+    subtitle: str | None
+    authors: list[str]
+    isbn: str | None
+    price: str | None
+    pages_binding: str | None
+    year: str | None
+    series: str | None
+    keywords: list[str]
+    description: str | None
+
+
+def _dumps(obj: Book | list[Book], indent: bool = False) -> bytes:
+    """Serialise books to UTF-8 JSON bytes.
+
+    Uses orjson when installed (it handles dataclasses natively and is much
+    faster), otherwise the standard library.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        default=asdict,
+    ).encode("utf-8")
+
+
+def _dump(books: list[Book], fh: BinaryIO, indent: bool = False) -> None:
+    """Write books as a JSON array, plus a trailing newline, to a binary file.
+
+    orjson builds the whole document as bytes in one fast call. The
+    standard library fallback streams it into the file instead, so the
+    document is never held in memory as one string.
+    """
+    if orjson is not None:
+        fh.write(_dumps(books, indent=indent))
+        fh.write(b"\n")
+        return
+    text = io.TextIOWrapper(fh, encoding="utf-8")
+    try:
+        json.dump(
+            books,
+            text,
+            ensure_ascii=False,
+            indent=2 if indent else None,
+            default=asdict,
+        )
+        text.write("\n")
+    finally:
+        # Flush, but leave fh (possibly stdout) open for the caller
+        text.detach()
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+
+class AdaptiveLimiter:
+    """Thread-safe request pacer that slows down only when asked to.
+
+    Requests are spaced at least ``min_interval`` seconds apart across all
+    threads. The server can push the next request further out with a
+    ``Retry-After`` header or an exhausted ``X-RateLimit-Remaining`` plus
+    ``X-RateLimit-Reset``; retry backoff uses the same mechanism, so a 429
+    slows every worker down, not just the one that received it.
+    """
+
+    def __init__(self, min_interval: float = 0.1):
+        self.min_interval = min_interval
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next request may be sent, reserving its slot."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed)
+            self._next_allowed = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def defer(self, delay: float) -> None:
+        """Allow no further requests for ``delay`` seconds from now."""
+        with self._lock:
+            self._next_allowed = max(
+                self._next_allowed, time.monotonic() + delay
+            )
+
+    def update(self, resp: requests.Response) -> None:
+        """Honour rate-limit hints in the headers of a response."""
+        delay = _header_delay(resp.headers.get("Retry-After"))
+        if resp.headers.get("X-RateLimit-Remaining", "").strip() == "0":
+            reset = _header_delay(resp.headers.get("X-RateLimit-Reset"))
+            delay = max(delay or 0.0, reset or 0.0)
+        if delay:
+            self.defer(delay)
+
+
+def _header_delay(value: str | None) -> float | None:
+    """Convert a Retry-After / X-RateLimit-Reset value into seconds from now.
+
+    Accepts delta seconds, a Unix timestamp or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(when.timestamp() - time.time(), 0.0)
+    if seconds > 1e9:  # absolute Unix timestamp
+        seconds -= time.time()
+    return max(seconds, 0.0)
+
+
+LIMITER = AdaptiveLimiter(min_interval=0.1)
+
+
+def _get(url: str, headers: dict | None = None) -> requests.Response:
+    """GET a URL through the shared cached session.
+
+    Network requests are paced by :data:`LIMITER`; URLs with a fresh entry in
+    the local cache skip the wait, so cached re-runs are not throttled.
+    Expired entries are revalidated over the network and paced like any
+    other request. 429 and 5xx responses are retried with exponential
+    backoff and jitter.
+    """
+    cached = _is_fresh_in_cache(url)
+    attempt = 0
+    while True:
+        if not cached:
+            LIMITER.wait()
+        resp = SESSION.get(url, headers=headers, timeout=30)
+        if not resp.from_cache or getattr(resp, "revalidated", False):
+            LIMITER.update(resp)
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            resp.raise_for_status()
+            return resp
+
+        backoff = RETRY_BACKOFF * 2**attempt
+        delay = backoff + random.uniform(0, RETRY_BACKOFF)
+        log.info("  HTTP %d, retrying in %.1fs", resp.status_code, delay)
+        LIMITER.defer(delay)
+        cached = False
+        attempt += 1
+
+
+def _is_fresh_in_cache(url: str) -> bool:
+    """Whether SESSION can answer a GET for ``url`` without the network."""
+    key = SESSION.cache.create_key(requests.Request("GET", url))
+    cached = SESSION.cache.get_response(key)
+    return cached is not None and not cached.is_expired
+
+
+# ---------------------------------------------------------------------------
+# Parsed page cache
+# ---------------------------------------------------------------------------
+
+
+# Bump whenever _parse_detail_page extracts something differently, so
+# pages parsed by an older version are parsed again even if unchanged
+PARSER_VERSION = 1
+
+# Stored parses are only reused by the same parser and Book layout
+_PAGE_CACHE_VERSION = "{}:{}".format(
+    PARSER_VERSION,
+    hashlib.sha1(" ".join(Book.__slots__).encode()).hexdigest()[:12],
+)
+
+
+class PageCache:
+    """SQLite store of parsed books with the HTTP validators they came with.
+
+    Keyed by detail page URL. A page whose validators the server confirms
+    unchanged (304, or the same ETag / Last-Modified as before) reuses its
+    stored parse instead of being parsed again. Each parse is stored with
+    the parser and Book version that produced it; entries from another
+    version, or that no longer load, count as missing.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(pages)")
+            }
+            if columns and "version" not in columns:
+                # Written before entries were versioned, so none can be trusted
+                self._conn.execute("DROP TABLE pages")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                "book TEXT NOT NULL, version TEXT NOT NULL)"
+            )
+
+    def get(self, url: str) -> tuple[str | None, str | None, Book] | None:
+        """Return (etag, last_modified, book) stored for a URL, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, book, version FROM pages "
+                "WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, book, version = row
+        if version != _PAGE_CACHE_VERSION:
+            return None
+        try:
+            return etag, last_modified, Book(**json.loads(book))
+        except (ValueError, TypeError):
+            return None
+
+    def put(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        book: Book,
+    ) -> None:
+        """Store the parsed book for a URL with its response validators."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (
+                    url,
+                    etag,
+                    last_modified,
+                    _dumps(book).decode(),
+                    _PAGE_CACHE_VERSION,
+                ),
+            )
+
+    def clear(self) -> None:
+        """Forget all stored pages."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages")
+
+
+_page_cache: PageCache | None = None
+_page_cache_lock = threading.Lock()
+
+
+def _get_page_cache() -> PageCache:
+    """Open the shared :class:`PageCache` on first use.
+
+    Opened lazily so that importing the module (including in the parse
+    worker processes) creates no cache directory or database.
+    """
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache(
+                Path(platformdirs.user_cache_dir())
+                / "matthes-seitz-catalog-pages.sqlite"
+            )
+        return _page_cache
+
+
 # ---------------------------------------------------------------------------
 # URL Collector — paginate all imprint catalogs
 # ---------------------------------------------------------------------------
@@ -71,79 +471,142 @@ def collect_urls(
     """
     if imprints is None:
         imprints = ALL_IMPRINTS
+    if not imprints:
+        return []
+
+    # One pool serves the listing pages of all imprints, so together they
+    # never exceed MAX_WORKERS parallel requests
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        first_pages = list(ex.map(_fetch_first_listing_page, imprints, repeat(limit)))
+
+        # The first pages revealed the totals, so queue every remaining page
+        # of every imprint at once
+        futures = [
+            [
+                ex.submit(_fetch_listing_page, _catalog_url(imprint), page_idx, imprint)
+                for page_idx in range(1, num_pages)
+            ]
+            for imprint, (_, _, num_pages) in zip(imprints, first_pages)
+        ]
+
+        all_books = []
+        for imprint, (books, total, num_pages), page_futures in zip(
+            imprints, first_pages, futures
+        ):
+            for page_idx, future in enumerate(page_futures, start=1):
+                books_on_page = future.result()
+                if books_on_page is None:
+                    continue
+                books.extend(books_on_page)
+                log.info(
+                    "  %s page %d/%d — %d URLs",
+                    imprint,
+                    page_idx + 1,
+                    num_pages,
+                    len(books),
+                )
+
+            expected = min(total, limit) if limit else total
+            if len(books) < expected:
+                log.warning(
+                    "  %s: collected only %d of %d titles",
+                    imprint,
+                    len(books),
+                    expected,
+                )
+            all_books.extend(books)
+
+    # The same title can be listed twice (across imprints or pages); fetch
+    # and parse it only once
+    seen: set[str] = set()
+    unique = []
+    for book in all_books:
+        if book["url"] not in seen:
+            seen.add(book["url"])
+            unique.append(book)
+    if len(unique) < len(all_books):
+        log.info("Removed %d duplicate URLs", len(all_books) - len(unique))
+    all_books = unique
 
-    all_books: list[dict] = []
+    if limit:
+        return all_books[:limit]
+    return all_books
 
-    for imprint in imprints:
-        catalog_url = f"{BASE_URL}/{imprint}/lieferbar.html"
-        log.info("Collecting URLs for imprint: %s", imprint)
 
-        try:
-            resp = requests.get(catalog_url, headers=HEADERS, timeout=30)
-            resp.raise_for_status()
-        except requests.RequestException as e:
-            log.warning("  Skipping imprint %s: %s", imprint, e)
-            continue
-
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Extract total count from pager ("Anzahl: 1587")
-        pager = soup.select_one("div#listpager p")
-        total = 0
-        if pager:
-            m = re.search(r"(\d[\d.]*)", pager.get_text())
-            if m:
-                total = int(m.group(1).replace(".", ""))
-        log.info("  %s: %d titles", imprint, total)
+def _catalog_url(imprint: str) -> str:
+    return f"{BASE_URL}/{imprint}/lieferbar.html"
+
 
-        # Extract URLs from first page
-        books_on_page = _extract_urls_from_page(soup, imprint)
-        all_books.extend(books_on_page)
+def _fetch_first_listing_page(
+    imprint: str, limit: int | None
+) -> tuple[list[dict], int, int]:
+    """Fetch an imprint's first catalog page.
 
-        if limit and len(all_books) >= limit:
-            return all_books[:limit]
+    Returns:
+        The book URLs on it, the imprint's total title count from the pager
+        and the number of listing pages still worth fetching for ``limit``.
+    """
+    catalog_url = _catalog_url(imprint)
+    log.info("Collecting URLs for imprint: %s", imprint)
+
+    try:
+        resp = _get(catalog_url)
+    except requests.RequestException as e:
+        log.warning("  Skipping imprint %s: %s", imprint, e)
+        return [], 0, 1
+
+    # Extract total count from pager ("Anzahl: 1587")
+    total = 0
+    m = _PAGER_RE.search(resp.content)
+    if m:
+        total = int(m.group(1).replace(b".", b""))
+        log.info("  %s: %d titles", imprint, total)
+    else:
+        log.warning(
+            "  %s: no title count in pager, only the first page is scraped",
+            imprint,
+        )
 
-        # Paginate remaining pages (24 items per page, 0-indexed ?p= param)
-        if total > 24:
-            num_pages = (total + 23) // 24
-            for page_idx in range(1, num_pages):
-                if limit and len(all_books) >= limit:
-                    return all_books[:limit]
+    # Extract URLs from first page
+    books = _extract_urls_from_page(resp.content, imprint)
+    if not books:
+        log.warning("  %s page 1: no book links found", imprint)
 
-                page_url = f"{catalog_url}?p={page_idx}"
-                time.sleep(1.0)
-                try:
-                    resp = requests.get(page_url, headers=HEADERS, timeout=30)
-                    resp.raise_for_status()
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    books_on_page = _extract_urls_from_page(soup, imprint)
-                    all_books.extend(books_on_page)
-                    log.info(
-                        "  Page %d/%d — %d URLs total",
-                        page_idx + 1,
-                        num_pages,
-                        len(all_books),
-                    )
-                except requests.RequestException as e:
-                    log.warning("  Failed page %d: %s", page_idx + 1, e)
+    if limit and len(books) >= limit:
+        return books[:limit], total, 1
 
+    # Remaining pages: 24 items per page, 0-indexed ?p= param
+    num_pages = max(1, (total + 23) // 24)
     if limit:
-        return all_books[:limit]
-    return all_books
+        needed = (limit - len(books) + 23) // 24
+        num_pages = min(num_pages, 1 + needed)
+    return books, total, num_pages
+
+
+def _fetch_listing_page(
+    catalog_url: str, page_idx: int, imprint: str
+) -> list[dict] | None:
+    """Fetch one paginated catalog listing page and extract its book URLs."""
+    page_url = f"{catalog_url}?p={page_idx}"
+    try:
+        resp = _get(page_url)
+    except requests.RequestException as e:
+        log.warning("  Failed page %d: %s", page_idx + 1, e)
+        return None
+    books = _extract_urls_from_page(resp.content, imprint)
+    if not books:
+        log.warning("  %s page %d: no book links found", imprint, page_idx + 1)
+    return books
 
 
-def _extract_urls_from_page(soup: BeautifulSoup, imprint: str) -> list[dict]:
+def _extract_urls_from_page(page: bytes, imprint: str) -> list[dict]:
     """Extract book URLs from a catalog listing page."""
     books = []
-    for item in soup.select("li.item.item_product"):
-        link = item.select_one("h3.title a")
-        if link and link.get("href"):
-            href = link["href"]
-            if not href.startswith("http"):
-                href = urljoin(BASE_URL, href)
-            # Strip tracking params like ?lid=1
-            href = re.sub(r"\?.*$", "", href)
-            books.append({"url": href, "imprint": imprint})
+    for m in _LISTING_URL_RE.finditer(page):
+        href = html.unescape(m.group(1).decode())
+        if not href.startswith("http"):
+            href = urljoin(BASE_URL, href)
+        books.append({"url": href, "imprint": imprint})
     return books
 
 
@@ -152,122 +615,413 @@ def _extract_urls_from_page(soup: BeautifulSoup, imprint: str) -> list[dict]:
 # ---------------------------------------------------------------------------
 
 
-def scrape_books(book_urls: list[dict]) -> list[dict]:
+class FetchedPage(NamedTuple):
+    """A downloaded detail page that still needs parsing."""
+
+    html: bytes
+    url: str
+    imprint: str
+    etag: str | None
+    last_modified: str | None
+
+
+def scrape_books(
+    book_urls: list[dict],
+    checkpoint_path: Path | None = None,
+) -> list[Book]:
     """Scrape detail pages for all collected book URLs.
 
     Args:
         book_urls: List of dicts with "url" and "imprint" keys.
+        checkpoint_path: Optional JSONL file to resume from and append
+            progress to. See :func:`iter_books`.
 
     Returns:
-        List of book metadata dicts.
+        List of Book records.
     """
-    results = []
-    total = len(book_urls)
+    return list(iter_books(book_urls, checkpoint_path=checkpoint_path))
+
 
-    for i, entry in enumerate(book_urls):
-        url = entry["url"]
-        imprint = entry["imprint"]
-        log.info("Scraping %d/%d: %s", i + 1, total, url.split("/")[-1])
+def iter_books(
+    book_urls: list[dict],
+    checkpoint_path: Path | None = None,
+) -> Iterator[Book]:
+    """Scrape detail pages, yielding books while later pages still download.
 
+    Books are parsed, checkpointed and yielded in batches of
+    ``PARSE_CHUNKSIZE`` as soon as each batch has been fetched and parsed.
+
+    Args:
+        book_urls: List of dicts with "url" and "imprint" keys.
+        checkpoint_path: Optional JSONL file recording progress. Books
+            already in it are not scraped again, and newly scraped books
+            are appended batch by batch (and on an error, everything
+            fetched so far), so an interrupted run can be resumed.
+
+    Yields:
+        Book records, in the order of ``book_urls``.
+    """
+    done = _load_checkpoint(checkpoint_path) if checkpoint_path else {}
+    todo = [entry for entry in book_urls if entry["url"] not in done]
+    total = len(todo)
+    if done:
+        log.info(
+            "Resuming from %s: %d of %d books already scraped",
+            checkpoint_path,
+            len(book_urls) - total,
+            len(book_urls),
+        )
+
+    # Fetching is I/O-bound and runs on threads; parsing is CPU-bound and
+    # runs in worker processes so it is not serialised by the GIL. The two
+    # overlap: fetched pages go to the parsers in batches while later pages
+    # are still downloading, and each batch is checkpointed and yielded as
+    # soon as it has been parsed.
+    if total > PARSE_CHUNKSIZE:
+        parse_ex = ProcessPoolExecutor(
+            mp_context=_parse_mp_context(), initializer=_ignore_sigint
+        )
+    else:
+        # Too few pages to amortise starting worker processes
+        parse_ex = ThreadPoolExecutor(max_workers=1)
+    max_pending = 2 * (os.cpu_count() or 1)
+    with (
+        ThreadPoolExecutor(max_workers=MAX_WORKERS) as fetch_ex,
+        parse_ex,
+        _open_checkpoint(checkpoint_path) as checkpoint,
+    ):
+        pending: deque[tuple[list, Future]] = deque()
+        batch = []
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
-            resp.raise_for_status()
-            book = _parse_detail_page(resp.text, url, imprint)
-            if book:
-                results.append(book)
-        except requests.RequestException as e:
-            log.warning("  Failed: %s", e)
+            fetches = iter(
+                [
+                    fetch_ex.submit(_fetch_detail_page, entry, i, total)
+                    for i, entry in enumerate(todo, start=1)
+                ]
+            )
+            for entry in book_urls:
+                if entry["url"] in done:
+                    item = done[entry["url"]]
+                else:
+                    fetch = next(fetches)
+                    # Hand back parsed batches while this page downloads
+                    while pending and not fetch.done():
+                        wait([fetch, pending[0][1]], return_when=FIRST_COMPLETED)
+                        while pending and pending[0][1].done():
+                            yield from _finish_batch(
+                                *pending.popleft(), done, checkpoint
+                            )
+                    item = fetch.result()
+                if item:
+                    batch.append(item)
+                if len(batch) == PARSE_CHUNKSIZE:
+                    pending.append(_submit_batch(parse_ex, batch))
+                    batch = []
+                    if len(pending) > max_pending:
+                        yield from _finish_batch(*pending.popleft(), done, checkpoint)
+            if batch:
+                pending.append(_submit_batch(parse_ex, batch))
+            while pending:
+                yield from _finish_batch(*pending.popleft(), done, checkpoint)
+        except BaseException:
+            # Checkpoint every page fetched so far before giving up, so a
+            # resumed run does not download it again. The unsubmitted batch,
+            # and any batch the workers could not finish, is parsed here.
+            fetch_ex.shutdown(cancel_futures=True)
+            if batch:
+                pending.append(_parse_batch_inline(batch))
+            while pending:
+                unsaved, parsed = pending.popleft()
+                try:
+                    try:
+                        _finish_batch(unsaved, parsed, done, checkpoint)
+                    except Exception:
+                        _finish_batch(
+                            *_parse_batch_inline(unsaved), done, checkpoint
+                        )
+                except Exception as e:
+                    log.warning(
+                        "  Could not checkpoint %d pages: %s", len(unsaved), e
+                    )
+            raise
+        finally:
+            # Don't keep downloading after an error, Ctrl-C or an abandoned
+            # generator
+            fetch_ex.shutdown(cancel_futures=True)
+
+
+def _parse_mp_context() -> multiprocessing.context.BaseContext:
+    """Start method for the parse workers.
+
+    The workers are started while fetch threads are busy inside requests,
+    urllib3 and sqlite, and forking a multi-threaded process can deadlock
+    the child. Use a fork server where available, else the platform default
+    (spawn on Windows and macOS).
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context()
+
+
+def _ignore_sigint() -> None:
+    """Parse worker initializer: leave Ctrl-C to the main process.
+
+    SIGINT goes to the whole process group; the main process handles it
+    and still needs the workers to parse what was fetched before it.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _submit_batch(
+    parse_ex: Executor, batch: list[Book | FetchedPage]
+) -> tuple[list[Book | FetchedPage], Future]:
+    """Send the pages of a fetched batch to the parsers.
+
+    Unchanged pages come back from the fetch already parsed as Books; only
+    the FetchedPages need parsing.
+    """
+    pages = [item for item in batch if isinstance(item, FetchedPage)]
+    return batch, parse_ex.submit(_parse_detail_batch, pages)
+
+
+def _parse_batch_inline(
+    batch: list[Book | FetchedPage],
+) -> tuple[list[Book | FetchedPage], Future]:
+    """Parse a batch in this process, shaped like :func:`_submit_batch`."""
+    parsed: Future = Future()
+    pages = [item for item in batch if isinstance(item, FetchedPage)]
+    parsed.set_result(_parse_detail_batch(pages))
+    return batch, parsed
+
+
+def _finish_batch(
+    batch: list[Book | FetchedPage],
+    parsed: Future,
+    done: dict[str, Book],
+    checkpoint: BinaryIO | None,
+) -> list[Book]:
+    """Merge a parsed batch back into order, caching and checkpointing it."""
+    results = iter(parsed.result())
+    books = []
+    for item in batch:
+        if isinstance(item, FetchedPage):
+            book = next(results)
+            if not book:
+                continue
+            if item.etag or item.last_modified:
+                _get_page_cache().put(item.url, item.etag, item.last_modified, book)
+        else:
+            book = item
+        books.append(book)
+        if checkpoint and book.url not in done:
+            checkpoint.write(_dumps(book) + b"\n")
+    if checkpoint:
+        checkpoint.flush()
+    return books
+
+
+def _load_checkpoint(path: Path) -> dict[str, Book]:
+    """Load the books recorded in a JSONL checkpoint file, keyed by URL."""
+    books: dict[str, Book] = {}
+    if not path.exists():
+        return books
+    with path.open("rb") as fh:
+        for line in fh:
+            try:
+                book = Book(**json.loads(line))
+            except (ValueError, TypeError):
+                # Typically a line cut short by a crash mid-write
+                continue
+            books[book.url] = book
+    return books
+
+
+def _open_checkpoint(
+    path: Path | None,
+) -> AbstractContextManager[BinaryIO | None]:
+    """Open a checkpoint file for appending, or a no-op if path is None.
+
+    If a crash cut the last line short, a newline is written first so the
+    next record starts on a line of its own instead of joining the broken
+    one.
+    """
+    if path is None:
+        return nullcontext(None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fh = path.open("ab")
+    if fh.tell() > 0:
+        with path.open("rb") as existing:
+            existing.seek(-1, os.SEEK_END)
+            if existing.read(1) != b"\n":
+                fh.write(b"\n")
+    return fh
+
+
+def _fetch_detail_page(entry: dict, i: int, total: int) -> Book | FetchedPage | None:
+    """Fetch a single book detail page.
 
-        if i < total - 1:
-            time.sleep(0.5)
+    Sends a conditional request when the page has been parsed before. If
+    the server reports it unchanged, the previous parse is reused.
+
+    Returns:
+        The stored Book for an unchanged page, otherwise the FetchedPage
+        to parse. None on failure.
+    """
+    url = entry["url"]
+    imprint = entry["imprint"]
+    log.info("Scraping %d/%d: %s", i, total, url.split("/")[-1])
+
+    known = _get_page_cache().get(url)
+    headers = {}
+    if known:
+        known_etag, known_last_modified, _ = known
+        if known_etag:
+            headers["If-None-Match"] = known_etag
+        if known_last_modified:
+            headers["If-Modified-Since"] = known_last_modified
+
+    try:
+        resp = _get(url, headers=headers)
+    except requests.RequestException as e:
+        log.warning("  Failed: %s", e)
+        return None
+
+    # A fresh or revalidated HTTP cache hit comes back as a 200 with the
+    # stored validators, so compare those too, not just the status code
+    validators = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    if known and (
+        resp.status_code == 304 or (any(validators) and validators == known[:2])
+    ):
+        return known[2]
+    return FetchedPage(resp.content, url, imprint, *validators)
 
-    return results
 
+def _parse_detail_batch(pages: list[FetchedPage]) -> list[Book | None]:
+    """Process pool entry point: parse a batch of fetched pages in order."""
+    return [_parse_detail_page(p.html, p.url, p.imprint) for p in pages]
 
-def _parse_detail_page(html: str, url: str, imprint: str) -> dict | None:
+
+def _parse_detail_page(html: bytes, url: str, imprint: str) -> Book | None:
     """Parse a book detail page and extract structured metadata."""
-    soup = BeautifulSoup(html, "html.parser")
+    tree = LexborHTMLParser(html)
+    parts = _find_detail_parts(tree)
 
     # Title (required)
-    title_el = soup.select_one("h1.title")
+    title_el = _first(parts, "title")
     if not title_el:
         log.warning("  No title found, skipping")
         return None
-    title = title_el.get_text(strip=True)
+    title = title_el.text(strip=True)
 
     # Subtitle (optional)
-    subtitle_el = soup.select_one("h2.subtitle")
-    subtitle = subtitle_el.get_text(strip=True) if subtitle_el else None
+    subtitle_el = _first(parts, "subtitle")
+    subtitle = subtitle_el.text(strip=True) if subtitle_el else None
 
-    # Authors
-    author_els = soup.select("div.authors a.author")
-    authors = [a.get_text(strip=True) for a in author_els]
+    # Authors (from every authors block, e.g. author and translator)
+    authors = [
+        a.text(strip=True)
+        for authors_el in parts.get("authors", [])
+        for a in authors_el.css("a.author")
+    ]
 
     # ISBN — remove invisible span containing compact ISBN before extracting
     isbn = None
-    number_el = soup.select_one("div.number")
+    number_el = _first(parts, "number")
     if number_el:
-        for inv in number_el.select("span.invisible"):
+        for inv in number_el.css("span.invisible"):
             inv.decompose()
-        text = number_el.get_text(strip=True)
-        m = re.search(r"(978[\d-]{10,})", text)
+        text = number_el.text(strip=True)
+        m = _ISBN_RE.search(text)
         if m:
             isbn = m.group(1).strip()
 
     # Price
     price = None
-    price_el = soup.select_one("div.price span")
+    price_el = _first(parts, "price", "span")
     if price_el:
-        price = price_el.get_text(strip=True)
+        price = price_el.text(strip=True)
 
     # Pages/Format (e.g. "92 Seiten, Klappenbroschur")
     info = None
-    info_el = soup.select_one("div.info")
+    info_el = _first(parts, "info")
     if info_el:
-        info = info_el.get_text(strip=True)
+        info = info_el.text(strip=True)
 
     # Publication date
     date = None
-    date_el = soup.select_one("div.dateof")
+    date_el = _first(parts, "dateof")
     if date_el:
-        text = date_el.get_text(strip=True)
-        text = re.sub(r"^Veröffentlicht:\s*", "", text)
+        text = date_el.text(strip=True)
+        text = _DATE_PREFIX_RE.sub("", text)
         date = text.strip()
 
     # Series (e.g. "Fröhliche Wissenschaft")
     series = None
-    series_el = soup.select_one("div.serial a")
+    series_el = _first(parts, "serial", "a")
     if series_el:
-        series = series_el.get_text(strip=True)
+        series = series_el.text(strip=True)
 
     # Keywords (plain comma-separated text, not links)
     keywords = []
-    kw_el = soup.select_one("div.keywords")
+    kw_el = _first(parts, "keywords")
     if kw_el:
-        text = kw_el.get_text(strip=True)
-        text = re.sub(r"^Schlagworte:\s*", "", text)
+        text = kw_el.text(strip=True)
+        text = _KW_PREFIX_RE.sub("", text)
         keywords = [kw.strip() for kw in text.split(",") if kw.strip()]
 
     # Blurb / Description
     description = None
-    desc_el = soup.select_one("div#pdesc div.description")
+    desc_el = _first(parts, "pdesc", "div.description")
     if desc_el:
-        description = desc_el.get_text(separator="\n", strip=True)
-
-    return {
-        "url": url,
-        "imprint": imprint,
-        "title": title,
-        "subtitle": subtitle,
-        "authors": authors,
-        "isbn": isbn,
-        "price": price,
-        "pages_binding": info,
-        "year": date,
-        "series": series,
-        "keywords": keywords,
-        "description": description,
-    }
+        description = desc_el.text(separator="\n", strip=True)
+
+    return Book(
+        url=url,
+        imprint=imprint,
+        title=title,
+        subtitle=subtitle,
+        authors=authors,
+        isbn=isbn,
+        price=price,
+        pages_binding=info,
+        year=date,
+        series=series,
+        keywords=keywords,
+        description=description,
+    )
+
+
+def _find_detail_parts(tree: LexborHTMLParser) -> dict[str, list[LexborNode]]:
+    """Locate the metadata containers of a detail page in one DOM pass.
+
+    A single grouped selector walks the document once and returns every
+    container in document order; each is then classified by tag and class.
+    All containers of a kind are kept, so nested fields (author links,
+    price span, ...) can be looked up across them afterwards, just like
+    a descendant selector would.
+    """
+    parts: dict[str, list[LexborNode]] = {}
+    for node in tree.css(_DETAIL_SELECTOR):
+        attrs = node.attributes
+        if attrs.get("id") == "pdesc":
+            parts.setdefault("pdesc", []).append(node)
+        for cls in (attrs.get("class") or "").split():
+            part = _DETAIL_PARTS.get((node.tag, cls))
+            if part:
+                parts.setdefault(part, []).append(node)
+    return parts
+
+
+def _first(
+    parts: dict[str, list[LexborNode]], part: str, selector: str | None = None
+) -> LexborNode | None:
+    """Return the first container of a kind, or the first selector match
+    inside any of them, in document order."""
+    for node in parts.get(part, []):
+        found = node.css_first(selector) if selector else node
+        if found is not None:
+            return found
+    return None
 
 
 # ---------------------------------------------------------------------------
@@ -278,7 +1032,8 @@ def _parse_detail_page(html: str, url: str, imprint: str) -> dict | None:
 def scrape_catalog(
     imprints: list[str] | None = None,
     limit: int | None = None,
-) -> list[dict]:
+    checkpoint_path: Path | None = None,
+) -> list[Book]:
     """Scrape the complete catalog and return structured book data.
 
     This is the main programmatic entry point.
@@ -286,19 +1041,48 @@ def scrape_catalog(
     Args:
         imprints: Imprint slugs to scrape. Defaults to all.
         limit: Max titles to scrape. None for all (~1800).
+        checkpoint_path: Optional JSONL progress file; an interrupted
+            scrape resumes from it instead of starting over.
 
     Returns:
-        List of book metadata dicts.
+        List of Book records.
+    """
+    return list(
+        iter_catalog(
+            imprints=imprints, limit=limit, checkpoint_path=checkpoint_path
+        )
+    )
+
+
+def iter_catalog(
+    imprints: list[str] | None = None,
+    limit: int | None = None,
+    checkpoint_path: Path | None = None,
+) -> Iterator[Book]:
+    """Scrape the catalog, yielding each book as soon as it is parsed.
+
+    Streaming counterpart of :func:`scrape_catalog` for consumers that
+    write or process records incrementally.
+
+    Args:
+        imprints: Imprint slugs to scrape. Defaults to all.
+        limit: Max titles to scrape. None for all (~1800).
+        checkpoint_path: Optional JSONL progress file; an interrupted
+            scrape resumes from it instead of starting over.
+
+    Yields:
+        Book records.
     """
     log.info("Phase 1: Collecting URLs from catalog pages...")
     book_urls = collect_urls(imprints=imprints, limit=limit)
     log.info("Collected %d URLs", len(book_urls))
 
     log.info("Phase 2: Scraping detail pages...")
-    books = scrape_books(book_urls)
-    log.info("Scraped %d books", len(books))
-
-    return books
+    count = 0
+    for book in iter_books(book_urls, checkpoint_path=checkpoint_path):
+        count += 1
+        yield book
+    log.info("Scraped %d books", count)
 
 
 # ---------------------------------------------------------------------------
@@ -306,7 +1090,7 @@ def scrape_catalog(
 # ---------------------------------------------------------------------------
 
 
-def print_stats(books: list[dict]) -> None:
+def print_stats(books: list[Book]) -> None:
     """Print summary statistics about scraped data."""
     print(f"\n{'=' * 60}")
     print("Scrape Statistics")
@@ -314,36 +1098,36 @@ def print_stats(books: list[dict]) -> None:
     n = max(len(books), 1)
     print(f"Total books:           {len(books)}")
 
-    with_desc = sum(1 for b in books if b.get("description"))
-    print(f"With description:      {with_desc} ({100 * with_desc // n}%)")
+    # Single pass over all books
+    with_desc = with_kw = with_series = with_isbn = 0
+    imprint_counts: Counter[str] = Counter()
+    series_counts: Counter[str] = Counter()
+    for b in books:
+        if b.description:
+            with_desc += 1
+        if b.keywords:
+            with_kw += 1
+        if b.series:
+            with_series += 1
+            series_counts[b.series] += 1
+        if b.isbn:
+            with_isbn += 1
+        imprint_counts[b.imprint] += 1
 
-    with_kw = sum(1 for b in books if b.get("keywords"))
+    print(f"With description:      {with_desc} ({100 * with_desc // n}%)")
     print(f"With keywords:         {with_kw} ({100 * with_kw // n}%)")
-
-    with_series = sum(1 for b in books if b.get("series"))
     print(f"With series:           {with_series}")
-
-    with_isbn = sum(1 for b in books if b.get("isbn"))
     print(f"With ISBN:             {with_isbn}")
 
     # Imprint breakdown
-    imprint_counts: dict[str, int] = {}
-    for b in books:
-        imp = b.get("imprint", "unknown")
-        imprint_counts[imp] = imprint_counts.get(imp, 0) + 1
     print("\nBy imprint:")
-    for imp, count in sorted(imprint_counts.items(), key=lambda x: -x[1]):
+    for imp, count in imprint_counts.most_common():
         print(f"  {imp:30s} {count:5d}")
 
     # Top series
-    series_counts: dict[str, int] = {}
-    for b in books:
-        if b.get("series"):
-            s = b["series"]
-            series_counts[s] = series_counts.get(s, 0) + 1
     if series_counts:
         print("\nTop series:")
-        for s, count in sorted(series_counts.items(), key=lambda x: -x[1])[:10]:
+        for s, count in series_counts.most_common(10):
             print(f"  {s:40s} {count:4d}")
 
     print(f"{'=' * 60}\n")
@@ -364,20 +1148,33 @@ def main():
   matthes-seitz-catalog --limit 10                        # Test with 10 titles
   matthes-seitz-catalog --imprints friedenauer-presse     # Single imprint
   matthes-seitz-catalog --stdout | jq '.[] | .title'      # Pipe to jq
+  matthes-seitz-catalog --jsonl --stdout | jq .title      # Stream records
+  matthes-seitz-catalog --output catalog.json.gz          # Gzipped output
 """,
     )
     parser.add_argument(
         "-o",
         "--output",
         type=Path,
-        default=Path("catalog.json"),
-        help="Output JSON file path (default: catalog.json)",
+        default=None,
+        help="Output file path (default: catalog.json, or catalog.jsonl "
+        "with --jsonl)",
     )
     parser.add_argument(
         "--stdout",
         action="store_true",
         help="Write JSON to stdout instead of file",
     )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Write one JSON record per line as books are scraped",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Gzip the output, also on stdout (implied by a .gz output path)",
+    )
     parser.add_argument(
         "--limit",
         type=int,
@@ -391,6 +1188,18 @@ def main():
         default=None,
         help="Imprints to scrape (default: all)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Clear the HTTP response and parsed page caches before scraping",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="JSONL file recording progress so an interrupted run can resume "
+        "(default: <output>.progress.jsonl; removed after a successful run)",
+    )
     parser.add_argument(
         "-q",
         "--quiet",
@@ -402,7 +1211,40 @@ def main():
     if args.quiet:
         log.setLevel(logging.WARNING)
 
-    books = scrape_catalog(imprints=args.imprints, limit=args.limit)
+    if args.no_cache:
+        SESSION.cache.clear()
+        _get_page_cache().clear()
+
+    if args.output is None:
+        args.output = Path("catalog.jsonl" if args.jsonl else "catalog.json")
+    if args.gzip and args.output.suffix != ".gz":
+        args.output = args.output.with_name(args.output.name + ".gz")
+    output = None if args.stdout else args.output
+    compress = args.gzip or (output is not None and output.suffix == ".gz")
+    checkpoint = args.checkpoint
+    if checkpoint is None and output is not None:
+        checkpoint = output.with_name(output.name + ".progress.jsonl")
+
+    if args.jsonl:
+        # Write each record as soon as it is parsed
+        books = []
+        with _open_output(output, compress) as fh:
+            for book in iter_catalog(
+                imprints=args.imprints,
+                limit=args.limit,
+                checkpoint_path=checkpoint,
+            ):
+                fh.write(_dumps(book) + b"\n")
+                if not compress:
+                    # A gzip flush per record would hurt compression
+                    fh.flush()
+                books.append(book)
+    else:
+        books = scrape_catalog(
+            imprints=args.imprints,
+            limit=args.limit,
+            checkpoint_path=checkpoint,
+        )
 
     if not books:
         log.error("No books scraped")
@@ -411,14 +1253,35 @@ def main():
     if not args.quiet:
         print_stats(books)
 
-    json_output = json.dumps(books, ensure_ascii=False, indent=2)
-
-    if args.stdout:
-        print(json_output)
-    else:
-        args.output.parent.mkdir(parents=True, exist_ok=True)
-        args.output.write_text(json_output, encoding="utf-8")
-        log.info("Written %d books to %s", len(books), args.output)
+    if not args.jsonl:
+        # Compressed output is meant for machines, so skip indenting
+        with _open_output(output, compress) as fh:
+            _dump(books, fh, indent=not compress)
+
+    # The output is complete, so the next run should start fresh
+    if checkpoint is not None:
+        checkpoint.unlink(missing_ok=True)
+
+    if output is not None:
+        size_mb = output.stat().st_size / 1_000_000
+        log.info("Written %d books to %s (%.1f MB)", len(books), output, size_mb)
+
+
+def _open_output(
+    path: Path | None, compress: bool = False
+) -> AbstractContextManager[BinaryIO]:
+    """Open the output file for binary writing, or wrap stdout if path is None."""
+    if path is None:
+        # Flush pending text (e.g. stats) before writing bytes underneath it
+        sys.stdout.flush()
+        if compress:
+            # Closing the GzipFile writes the trailer but leaves stdout open
+            return gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb", compresslevel=6)
+        return nullcontext(sys.stdout.buffer)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        return gzip.open(path, "wb", compresslevel=6)
+    return path.open("wb")
 
 
 if __name__ == "__main__":
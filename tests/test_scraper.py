@@ -0,0 +1,419 @@
+"""Tests for the page parsers and scraping pipeline, using HTML fixtures."""
+
+import dataclasses
+import gzip
+import http.server
+import io
+import json
+import logging
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+import requests_cache
+
+from matthes_seitz_catalog import scraper
+
+LISTING_HTML = b"""<html><body>
+<div id="listpager"><p>Anzahl: 1.587</p></div>
+<ul class="products">
+  <li class="item item_product">
+    <img src="a.jpg">
+    <h3 class="title"><a href="/buch/erstes-buch.html?lid=1">Erstes Buch</a></h3>
+  </li>
+  <li class="item item_product first">
+    <h3 class="title">
+      <a class="link" href="https://www.matthes-seitz-berlin.de/buch/zweites.html">Z</a>
+    </h3>
+  </li>
+  <li data-id="3" class="item_product item">
+    <h3 class="title big"><a href="/buch/drittes.html">Drittes</a></h3>
+  </li>
+  <li class="item item_product"><span>Ohne Link</span></li>
+  <li class="item item_product">
+    <h3 class="title"><a href="/buch/viertes.html">Viertes</a></h3>
+  </li>
+  <li class="item_products"><h3 class="title"><a href="/buch/nein.html">N</a></h3></li>
+</ul>
+</body></html>"""
+
+
+def test_pager_count():
+    m = scraper._PAGER_RE.search(LISTING_HTML)
+    assert m is not None
+    assert m.group(1) == b"1.587"
+
+
+def test_extract_urls_from_page():
+    books = scraper._extract_urls_from_page(LISTING_HTML, "friedenauer-presse")
+    assert [b["url"] for b in books] == [
+        f"{scraper.BASE_URL}/buch/{slug}.html"
+        for slug in ("erstes-buch", "zweites", "drittes", "viertes")
+    ]
+    assert {b["imprint"] for b in books} == {"friedenauer-presse"}
+
+
+def test_extract_urls_decodes_entities():
+    page = (
+        b'<li class="item item_product">'
+        b'<h3 class="title"><a href="/buch/m&amp;s.html">M</a></h3></li>'
+    )
+    books = scraper._extract_urls_from_page(page, "a")
+    assert [b["url"] for b in books] == [f"{scraper.BASE_URL}/buch/m&s.html"]
+
+
+def test_collect_urls_warns_about_missing_titles(monkeypatch, caplog):
+    class Response:
+        content = LISTING_HTML.replace(b"1.587", b"6")
+
+    monkeypatch.setattr(scraper, "_get", lambda url, headers=None: Response())
+    with caplog.at_level(logging.WARNING, logger="matthes-seitz-catalog"):
+        books = scraper.collect_urls(imprints=["august-verlag"])
+    assert len(books) == 4
+    assert "collected only 4 of 6 titles" in caplog.text
+
+
+def test_collect_urls_warns_without_pager(monkeypatch, caplog):
+    class Response:
+        content = b"<ul></ul>"
+
+    monkeypatch.setattr(scraper, "_get", lambda url, headers=None: Response())
+    with caplog.at_level(logging.WARNING, logger="matthes-seitz-catalog"):
+        assert scraper.collect_urls(imprints=["august-verlag"]) == []
+    assert "no title count in pager" in caplog.text
+    assert "no book links found" in caplog.text
+
+
+def test_collect_urls_shares_the_request_limit(monkeypatch):
+    lock = threading.Lock()
+    active = peak = 0
+
+    def fake_get(url, headers=None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+
+        class Response:
+            content = LISTING_HTML.replace(b"1.587", b"240")
+
+        return Response()
+
+    monkeypatch.setattr(scraper, "_get", fake_get)
+    scraper.collect_urls()
+    assert 1 < peak <= scraper.MAX_WORKERS
+
+
+DETAIL_HTML = """<html><body>
+<h1 class="title">Large Language Kabbala</h1>
+<h2 class="subtitle">Eine kleine Geschichte der Großen Sprachmodelle</h2>
+<div class="authors"><a class="author" href="#">Martin Warnke</a></div>
+<div class="number">
+  ISBN <span class="invisible">9783751830607</span>978-3-7518-3060-7
+</div>
+<div class="price"><span>16,00 €</span></div>
+<div class="info">152 Seiten, Klappenbroschur</div>
+<div class="dateof">Veröffentlicht: 2026</div>
+<div class="serial"><a href="#">Fröhliche Wissenschaft</a></div>
+<div class="keywords">Schlagworte: KI, LLM , Sprachphilosophie</div>
+<div id="pdesc"><div class="description"><p>Erster Absatz.</p><p>Zweiter.</p></div></div>
+</body></html>""".encode()
+
+
+class DetailResponse:
+    status_code = 200
+    from_cache = False
+
+    def __init__(self, url):
+        slug = url.rsplit("/", 1)[1].encode()
+        self.content = DETAIL_HTML.replace(b"Kabbala", slug)
+        self.headers = {}
+
+
+def book_urls(n):
+    return [
+        {"url": f"{scraper.BASE_URL}/buch/b{i}", "imprint": "a"} for i in range(n)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def page_cache(monkeypatch, tmp_path):
+    cache = scraper.PageCache(tmp_path / "pages.sqlite")
+    monkeypatch.setattr(scraper, "_page_cache", cache)
+    return cache
+
+
+def test_import_creates_no_page_cache(tmp_path):
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path)}
+    code = "import matthes_seitz_catalog.scraper"
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    assert not (tmp_path / "matthes-seitz-catalog-pages.sqlite").exists()
+
+
+def test_parse_detail_page():
+    book = scraper._parse_detail_page(DETAIL_HTML, "u", "matthes-seitz-berlin")
+    assert book == scraper.Book(
+        url="u",
+        imprint="matthes-seitz-berlin",
+        title="Large Language Kabbala",
+        subtitle="Eine kleine Geschichte der Großen Sprachmodelle",
+        authors=["Martin Warnke"],
+        isbn="978-3-7518-3060-7",
+        price="16,00 €",
+        pages_binding="152 Seiten, Klappenbroschur",
+        year="2026",
+        series="Fröhliche Wissenschaft",
+        keywords=["KI", "LLM", "Sprachphilosophie"],
+        description="Erster Absatz.\nZweiter.",
+    )
+
+
+def test_parse_detail_page_merges_repeated_blocks():
+    html = b"""<html><body>
+    <h1 class="title">T</h1>
+    <div class="authors"><a class="author">A</a></div>
+    <div class="price">vergriffen</div>
+    <div class="authors"><a class="author">Translator</a></div>
+    <div class="price"><span>22 EUR</span></div>
+    </body></html>"""
+    book = scraper._parse_detail_page(html, "u", "a")
+    assert book.authors == ["A", "Translator"]
+    assert book.price == "22 EUR"
+
+
+# Forking the parse workers while fetch threads run warns on Python 3.12+
+@pytest.mark.filterwarnings("error::DeprecationWarning")
+def test_iter_books_yields_before_all_pages_are_fetched(monkeypatch):
+    release = threading.Event()
+
+    def fake_get(url, headers=None):
+        if int(url.rsplit("b", 1)[1]) >= 2 * scraper.PARSE_CHUNKSIZE:
+            assert release.wait(10)
+        return DetailResponse(url)
+
+    monkeypatch.setattr(scraper, "_get", fake_get)
+    books = scraper.iter_books(book_urls(3 * scraper.PARSE_CHUNKSIZE))
+    try:
+        first = next(books)
+        assert first.title == "Large Language b0"
+    finally:
+        release.set()
+    rest = list(books)
+    assert [b.title for b in rest] == [
+        f"Large Language b{i}" for i in range(1, 3 * scraper.PARSE_CHUNKSIZE)
+    ]
+
+
+@pytest.mark.parametrize("expired, waits", [(False, 0), (True, 1)])
+def test_get_paces_expired_cache_entries(monkeypatch, expired, waits):
+    class Cached:
+        status_code = 200
+        from_cache = True
+        revalidated = expired
+        is_expired = expired
+        headers = {}
+
+        def raise_for_status(self):
+            pass
+
+    class Cache:
+        def create_key(self, request):
+            return request.url
+
+        def get_response(self, key):
+            return Cached()
+
+    class Session:
+        cache = Cache()
+
+        def get(self, url, headers=None, timeout=None):
+            return Cached()
+
+    calls = []
+    monkeypatch.setattr(scraper, "SESSION", Session())
+    monkeypatch.setattr(scraper.LIMITER, "wait", lambda: calls.append("wait"))
+    monkeypatch.setattr(scraper.LIMITER, "update", lambda r: calls.append("update"))
+    scraper._get("https://example.org/buch/x.html")
+    assert calls == ["wait", "update"] * waits
+
+
+def test_iter_books_checkpoints_before_a_crash(monkeypatch, tmp_path):
+    checkpoint = tmp_path / "progress.jsonl"
+    crash_at = 3 * scraper.PARSE_CHUNKSIZE
+
+    def fake_get(url, headers=None):
+        if int(url.rsplit("b", 1)[1]) >= crash_at:
+            raise KeyboardInterrupt
+        return DetailResponse(url)
+
+    monkeypatch.setattr(scraper, "_get", fake_get)
+    books = scraper.iter_books(book_urls(crash_at + 10), checkpoint)
+    with pytest.raises(KeyboardInterrupt):
+        for _ in books:
+            pass
+    assert len(scraper._load_checkpoint(checkpoint)) == crash_at
+
+
+def test_checkpoint_survives_a_truncated_line(tmp_path):
+    checkpoint = tmp_path / "progress.jsonl"
+    checkpoint.write_bytes(b'{"url": "u0", "impr')
+    book = scraper._parse_detail_page(DETAIL_HTML, "u1", "a")
+    with scraper._open_checkpoint(checkpoint) as fh:
+        fh.write(scraper._dumps(book) + b"\n")
+    assert scraper._load_checkpoint(checkpoint) == {"u1": book}
+
+
+def test_get_retries_rate_limited_responses_only_once_each(monkeypatch):
+    requests_seen = 0
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            nonlocal requests_seen
+            requests_seen += 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    session = requests_cache.CachedSession(backend="memory")
+    session.mount("http://", scraper.SESSION.get_adapter("https://"))
+    monkeypatch.setattr(scraper, "SESSION", session)
+    monkeypatch.setattr(scraper, "RETRY_BACKOFF", 0.0)
+    try:
+        with pytest.raises(requests.HTTPError):
+            scraper._get(f"http://127.0.0.1:{server.server_port}/")
+    finally:
+        server.shutdown()
+    assert requests_seen == scraper.MAX_RETRIES + 1
+
+
+def test_page_cache_round_trip(page_cache):
+    book = scraper._parse_detail_page(DETAIL_HTML, "u", "a")
+    page_cache.put("u", '"e1"', None, book)
+    assert page_cache.get("u") == ('"e1"', None, book)
+
+
+@pytest.mark.parametrize(
+    "version, stored",
+    [
+        ("0:outdated", '{"url": "u", "imprint": "a", "title": "T"}'),
+        (scraper._PAGE_CACHE_VERSION, '{"url": "u", "renamed": "T"}'),
+    ],
+)
+def test_page_cache_ignores_stale_entries(page_cache, version, stored):
+    with page_cache._conn:
+        page_cache._conn.execute(
+            "INSERT INTO pages VALUES (?, ?, ?, ?, ?)",
+            ("u", '"e1"', None, stored, version),
+        )
+    assert page_cache.get("u") is None
+
+
+def test_page_cache_drops_unversioned_table(tmp_path):
+    path = tmp_path / "old-pages.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE pages (url TEXT PRIMARY KEY, etag TEXT, "
+            "last_modified TEXT, book TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO pages VALUES ('u', NULL, NULL, '{}')")
+    conn.close()
+    assert scraper.PageCache(path).get("u") is None
+
+
+def test_iter_books_reuses_parse_of_unchanged_pages(monkeypatch, page_cache):
+    stored = scraper._parse_detail_page(DETAIL_HTML, book_urls(1)[0]["url"], "a")
+    page_cache.put(stored.url, '"e1"', None, stored)
+
+    class NotModified:
+        status_code = 304
+        headers = {"ETag": '"e1"'}
+
+    def fake_get(url, headers=None):
+        assert headers == {"If-None-Match": '"e1"'}
+        return NotModified()
+
+    monkeypatch.setattr(scraper, "_get", fake_get)
+    assert list(scraper.iter_books(book_urls(1))) == [stored]
+
+
+def test_main_gzips_stdout(monkeypatch, capsysbinary):
+    book = scraper._parse_detail_page(DETAIL_HTML, "u", "a")
+    monkeypatch.setattr(scraper, "iter_catalog", lambda **kwargs: iter([book]))
+    monkeypatch.setattr(
+        sys, "argv", ["matthes-seitz-catalog", "--jsonl", "--stdout", "--gzip", "-q"]
+    )
+    scraper.main()
+    out = capsysbinary.readouterr().out
+    assert gzip.decompress(out) == scraper._dumps(book) + b"\n"
+
+
+@pytest.mark.parametrize("indent", [False, True])
+def test_dump_without_orjson_streams_to_file(monkeypatch, indent):
+    monkeypatch.setattr(scraper, "orjson", None)
+    book = scraper._parse_detail_page(DETAIL_HTML, "u", "a")
+    fh = io.BytesIO()
+    scraper._dump([book, book], fh, indent=indent)
+    assert not fh.closed
+    assert fh.getvalue().endswith(b"\n")
+    assert json.loads(fh.getvalue()) == [dataclasses.asdict(book)] * 2
+
+
+CTRL_C_SCRIPT = """
+import sys, time
+from pathlib import Path
+sys.path.insert(0, sys.argv[3])
+from test_scraper import DetailResponse, book_urls, scraper
+
+ready = Path(sys.argv[2])
+
+def fake_get(url, headers=None):
+    if int(url.rsplit("b", 1)[1]) >= 150:
+        ready.touch()
+        time.sleep(2)
+    return DetailResponse(url)
+
+scraper._get = fake_get
+for _ in scraper.iter_books(book_urls(200), Path(sys.argv[1])):
+    pass
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs process groups")
+def test_ctrl_c_checkpoints_every_fetched_page(tmp_path):
+    checkpoint = tmp_path / "progress.jsonl"
+    ready = tmp_path / "ready"
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path)}
+    proc = subprocess.Popen(
+        [sys.executable, "-c", CTRL_C_SCRIPT, checkpoint, ready, Path(__file__).parent],
+        env=env,
+        start_new_session=True,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not ready.exists():
+            assert time.monotonic() < deadline and proc.poll() is None
+            time.sleep(0.05)
+        time.sleep(1)  # let the main thread batch the 150 fetched pages
+        os.killpg(proc.pid, signal.SIGINT)
+        assert proc.wait(30) != 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    assert len(scraper._load_checkpoint(checkpoint)) == 150